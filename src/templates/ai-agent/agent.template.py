@@ -6,19 +6,54 @@ with tool integration, memory management, and safety features.
 """
 
 import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
+import os
+import re
+import time
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import uuid
 
-from langchain.memory import ConversationBufferMemory
+import orjson
 from langchain.tools import Tool
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 
 
+# Correlation IDs stay cryptographically random but amortize the RNG
+# cost: one os.urandom syscall refills enough bytes for 256 IDs instead
+# of a read per uuid4 call
+_ID_BYTES = 16
+_ID_REFILL = _ID_BYTES * 256
+_rand_buf = b""
+_rand_pos = 0
+
+
+def _new_correlation_id() -> str:
+    """Generate a random correlation ID from a batched urandom buffer"""
+    global _rand_buf, _rand_pos
+    if _rand_pos >= len(_rand_buf):
+        _rand_buf = os.urandom(_ID_REFILL)
+        _rand_pos = 0
+    start = _rand_pos
+    _rand_pos += _ID_BYTES
+    return _rand_buf[start:_rand_pos].hex()
+
+
+def _always_true(*_args: Any) -> bool:
+    """No-op validator bound when safety is disabled"""
+    return True
+
+
+def _noop(*_args: Any) -> None:
+    """No-op writer bound when memory is disabled"""
+    return None
+
+
 class MessageType(Enum):
     """Types of messages agents can send/receive"""
     REQUEST = "request"
@@ -35,15 +70,19 @@ class Priority(Enum):
     CRITICAL = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
-    """Standard message format for agent communication"""
+    """Standard message format for agent communication
+
+    Slotted to avoid the per-instance __dict__: messages are allocated
+    constantly, and slots cut memory and speed up attribute access.
+    """
     sender_id: str
     receiver_id: str
     message_type: MessageType
     content: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.now)
-    correlation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: int = field(default_factory=time.monotonic_ns)
+    correlation_id: str = field(default_factory=_new_correlation_id)
     priority: Priority = Priority.MEDIUM
 
 
@@ -60,6 +99,10 @@ class AgentConfig:
     safety_enabled: bool = True
     memory_enabled: bool = True
     max_retries: int = 3
+    max_batch_size: int = 32
+    max_concurrency: int = 4
+    memory_window: int = 100
+    tool_workers: int = 4
 
 
 class SafetyWrapper:
@@ -68,7 +111,16 @@ class SafetyWrapper:
     def __init__(self, rules: Optional[Dict[str, Any]] = None):
         self.rules = rules or self._default_rules()
         self.logger = logging.getLogger(f"{__name__}.SafetyWrapper")
-    
+
+        # Compile forbidden patterns once into a single alternation so
+        # each validation is one linear scan instead of N regex passes
+        patterns = self.rules.get("forbidden_patterns") or []
+        self._forbidden_re = (
+            re.compile("|".join(f"(?:{p})" for p in patterns))
+            if patterns else None
+        )
+
+
     def _default_rules(self) -> Dict[str, Any]:
         return {
             "max_output_length": 10000,
@@ -77,15 +129,25 @@ class SafetyWrapper:
             "rate_limit": 100,  # requests per minute
         }
     
-    async def validate_input(self, message: AgentMessage) -> bool:
-        """Validate incoming message"""
-        # Implement input validation logic
-        return True
-    
-    async def validate_output(self, response: Any) -> bool:
+    def validate_input(self, message: AgentMessage) -> bool:
+        """Validate incoming message
+
+        Kept synchronous: there is no I/O here, and a plain call avoids
+        the coroutine allocation an await would cost per message.
+        """
+        # Implement additional input validation logic as needed
+        return not self._contains_forbidden(message.content)
+
+    def validate_output(self, response: Any) -> bool:
         """Validate agent output before sending"""
-        # Implement output validation logic
-        return True
+        # Implement additional output validation logic as needed
+        return not self._contains_forbidden(getattr(response, "content", response))
+
+    def _contains_forbidden(self, content: Any) -> bool:
+        """Check content against the precompiled forbidden patterns"""
+        if self._forbidden_re is None:
+            return False
+        return self._forbidden_re.search(str(content)) is not None
 
 
 class BaseAgent:
@@ -99,93 +161,231 @@ class BaseAgent:
         # Initialize components
         self.memory = self._init_memory() if config.memory_enabled else None
         self.safety_wrapper = SafetyWrapper() if config.safety_enabled else None
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.tool_workers
+        )
         self.tools = self._init_tools(config.tools)
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+
+        # Priority queue so CRITICAL messages never wait behind a LOW
+        # backlog; the sequence counter keeps FIFO order within a
+        # priority and avoids comparing AgentMessage objects
+        self.message_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+
+        # Bind fast paths once so per-message code never branches on
+        # whether safety or memory is enabled
+        if self.safety_wrapper:
+            self._validate_in = self.safety_wrapper.validate_input
+            self._validate_out = self.safety_wrapper.validate_output
+        else:
+            self._validate_in = self._validate_out = _always_true
+        if self.memory is not None:
+            self._mem_extend = self.memory.extend
+            self._mem_write_pair = self._write_memory_pair
+        else:
+            self._mem_extend = self._mem_write_pair = _noop
+
+        # Dispatch table keyed on the enum's underlying value; a single
+        # dict lookup replaces the if/elif chain of enum comparisons
+        self._handlers: Dict[str, Callable] = {
+            MessageType.REQUEST.value: self._handle_request,
+            MessageType.NOTIFICATION.value: self._handle_notification,
+        }
         
         # State management
         self.is_running = False
         self.current_task = None
+        self._workers: List[asyncio.Task] = []
         
-    def _init_memory(self) -> ConversationBufferMemory:
-        """Initialize agent memory"""
-        return ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-    
-    def _init_tools(self, tools: List[Tool]) -> Dict[str, Tool]:
-        """Initialize tools available to the agent"""
-        return {tool.name: tool for tool in tools}
+    def _init_memory(self) -> collections.deque:
+        """Initialize agent memory as a bounded message window
+
+        A deque with maxlen gives O(1) appends and keeps resident memory
+        bounded regardless of agent uptime.
+        """
+        return collections.deque(maxlen=self.config.memory_window)
+
+    def get_memory(self) -> List[BaseMessage]:
+        """Return the current conversation window"""
+        return list(self.memory) if self.memory is not None else []
+
+    def _write_memory_pair(self, message: AgentMessage, response: Optional[AgentMessage]) -> None:
+        """Write an input/response pair to memory in one call"""
+        entries = [HumanMessage(content=orjson.dumps(message.content).decode())]
+        if response:
+            entries.append(AIMessage(content=orjson.dumps(response.content).decode()))
+        self.memory.extend(entries)
+
+
+    def _init_tools(self, tools: List[Tool]) -> Dict[str, Tuple[Tool, Callable]]:
+        """Initialize tools, resolving each tool's async runner up front
+
+        Resolving arun vs run once at registration avoids a hasattr check
+        and an unused-coroutine ternary on every use_tool call.
+        """
+        registry: Dict[str, Tuple[Tool, Callable]] = {}
+        for tool in tools:
+            if hasattr(tool, 'arun'):
+                runner = tool.arun
+            else:
+                # Run sync tools on the shared thread pool so a blocking
+                # call never stalls the event loop
+                async def runner(_tool=tool, **kwargs):
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        self._executor, functools.partial(_tool.run, **kwargs)
+                    )
+            registry[tool.name] = (tool, runner)
+        return registry
     
     async def start(self):
         """Start the agent"""
         self.is_running = True
-        self.logger.info(f"Agent {self.agent_id} started")
+        self.logger.info("Agent %s started", self.agent_id)
         
-        # Start message processing loop
-        asyncio.create_task(self._process_messages())
-    
+        # Start a bounded pool of message-processing workers so that
+        # independent I/O-bound handlers can overlap; references are
+        # held so the tasks cannot be garbage-collected mid-run
+        self._workers = [
+            asyncio.create_task(
+                self._process_messages(),
+                name=f"agent-{self.agent_id}-worker-{i}",
+            )
+            for i in range(self.config.max_concurrency)
+        ]
+
     async def stop(self):
         """Stop the agent"""
         self.is_running = False
-        self.logger.info(f"Agent {self.agent_id} stopped")
-    
+        # Cancel the workers and wait for them to unwind; cancellation
+        # interrupts the blocking queue.get() immediately, so shutdown
+        # needs no polling timeout or sentinel messages
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.logger.info("Agent %s stopped", self.agent_id)
+
     async def _process_messages(self):
         """Main message processing loop"""
         while self.is_running:
             try:
-                # Get message from queue with timeout
-                message = await asyncio.wait_for(
-                    self.message_queue.get(),
-                    timeout=1.0
-                )
-                
-                # Process message
-                await self.process_message(message)
-                
-            except asyncio.TimeoutError:
-                continue
+                # Block until a message arrives; stop() cancels this
+                # wait directly, so no polling timeout is needed
+                _, _, message = await self.message_queue.get()
+
+                # Opportunistically drain the queue to amortize
+                # per-message dispatch overhead
+                batch = [message]
+                while (not self.message_queue.empty()
+                       and len(batch) < self.config.max_batch_size):
+                    _, _, queued = self.message_queue.get_nowait()
+                    batch.append(queued)
+
+                # Process batch
+                await self.process_messages_batch(batch)
+
             except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
+                self.logger.error("Error processing messages: %s", e)
     
-    async def process_message(self, message: AgentMessage) -> Optional[AgentMessage]:
-        """Process incoming message"""
-        try:
-            # Validate input
-            if self.safety_wrapper:
-                if not await self.safety_wrapper.validate_input(message):
-                    raise ValueError("Message failed safety validation")
-            
-            # Store in memory if enabled
-            if self.memory:
-                self.memory.chat_memory.add_message(
-                    HumanMessage(content=str(message.content))
-                )
-            
-            # Process message based on type
-            if message.message_type == MessageType.REQUEST:
-                response = await self._handle_request(message)
-            elif message.message_type == MessageType.NOTIFICATION:
-                response = await self._handle_notification(message)
+    async def process_messages_batch(self, batch: List[AgentMessage]) -> List[Optional[AgentMessage]]:
+        """Process a batch of messages in a single pass
+
+        Safety validation and memory writes are batched, and handlers
+        run concurrently so I/O-bound work overlaps. Handler exceptions
+        are collected via gather(return_exceptions=True) and converted
+        to error responses in one place, keeping the per-message happy
+        path free of try/except setup.
+        """
+        responses: List[Optional[AgentMessage]] = []
+
+        # Validate inputs; a failing message becomes an error response
+        # instead of failing the whole drain
+        valid: List[AgentMessage] = []
+        for message in batch:
+            if self._validate_in(message):
+                valid.append(message)
+            else:
+                responses.append(self._create_error_response(
+                    message, "Message failed safety validation"
+                ))
+
+        # Store inputs in memory with a single batched write; the
+        # generator is never consumed when memory is disabled
+        self._mem_extend(
+            HumanMessage(content=orjson.dumps(m.content).decode())
+            for m in valid
+        )
+
+        # Dispatch handlers concurrently; exceptions come back as
+        # values instead of unwinding through per-message try/except
+        dispatched = [
+            (m, self._handlers.get(m.message_type.value)) for m in valid
+        ]
+        outcomes = iter(await asyncio.gather(
+            *(handler(m) for m, handler in dispatched if handler is not None),
+            return_exceptions=True,
+        ))
+        for message, handler in dispatched:
+            if handler is None:
+                responses.append(None)
+                continue
+            outcome = next(outcomes)
+            if isinstance(outcome, BaseException):
+                self.logger.error("Error processing message: %s", outcome)
+                responses.append(self._create_error_response(message, str(outcome)))
             else:
-                response = None
-            
-            # Validate output
-            if response and self.safety_wrapper:
-                if not await self.safety_wrapper.validate_output(response):
-                    raise ValueError("Response failed safety validation")
-            
-            # Store response in memory
-            if response and self.memory:
-                self.memory.chat_memory.add_message(
-                    AIMessage(content=str(response.content))
+                responses.append(outcome)
+
+        # Validate outputs; an unsafe response is dropped rather than
+        # failing the batch
+        for i, response in enumerate(responses):
+            if response and not self._validate_out(response):
+                self.logger.error(
+                    "Response failed safety validation: %s",
+                    response.correlation_id,
                 )
-            
-            return response
-            
+                responses[i] = None
+
+        # Store responses with a single batched write
+        self._mem_extend(
+            AIMessage(content=orjson.dumps(r.content).decode())
+            for r in responses if r
+        )
+
+        return responses
+
+    async def process_message(self, message: AgentMessage) -> Optional[AgentMessage]:
+        """Process incoming message, converting failures to error responses"""
+        try:
+            return await self._process_message_fast(message)
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error("Error processing message: %s", e)
             return self._create_error_response(message, str(e))
+
+    async def _process_message_fast(self, message: AgentMessage) -> Optional[AgentMessage]:
+        """Happy-path message processing
+
+        Deliberately free of try/except so the common case skips
+        exception-state setup; process_message wraps it to convert
+        failures into error responses.
+        """
+        # Validate input
+        if not self._validate_in(message):
+            raise ValueError("Message failed safety validation")
+
+        # Process message based on type
+        handler = self._handlers.get(message.message_type.value)
+        response = await handler(message) if handler else None
+
+        # Validate output
+        if response and not self._validate_out(response):
+            raise ValueError("Response failed safety validation")
+
+        # Write the input/response pair to memory in a single call
+        self._mem_write_pair(message, response)
+
+        return response
     
     async def _handle_request(self, message: AgentMessage) -> AgentMessage:
         """Handle request messages"""
@@ -195,36 +395,52 @@ class BaseAgent:
     async def _handle_notification(self, message: AgentMessage) -> Optional[AgentMessage]:
         """Handle notification messages"""
         # Override in subclasses if needed
-        self.logger.info(f"Received notification: {message.content}")
+        self.logger.info("Received notification: %s", message.content)
         return None
     
+    # Error responses share one shape; copying a prebuilt template is
+    # cheaper than constructing a fresh dict literal under error storms
+    _ERROR_TEMPLATE = {"error": None, "original_message_id": None}
+
     def _create_error_response(self, original_message: AgentMessage, error: str) -> AgentMessage:
         """Create error response message"""
+        content = self._ERROR_TEMPLATE.copy()
+        content["error"] = error
+        content["original_message_id"] = original_message.correlation_id
         return AgentMessage(
             sender_id=self.agent_id,
             receiver_id=original_message.sender_id,
             message_type=MessageType.ERROR,
-            content={"error": error, "original_message_id": original_message.correlation_id},
+            content=content,
             correlation_id=original_message.correlation_id
         )
     
+    async def enqueue_message(self, message: AgentMessage):
+        """Queue a message for processing, ordered by priority"""
+        await self.message_queue.put(
+            (-message.priority.value, next(self._seq), message)
+        )
+
     async def send_message(self, message: AgentMessage):
         """Send message to another agent or system"""
-        # Implement message sending logic
-        self.logger.info(f"Sending message: {message}")
+        # orjson serializes the dataclass (enums, ints) straight to
+        # wire-ready bytes, far faster than stdlib json
+        payload = orjson.dumps(message)
+        # Implement message sending logic using the encoded payload
+        self.logger.info("Sending message: %s", payload)
     
     async def use_tool(self, tool_name: str, **kwargs) -> Any:
         """Use a registered tool"""
         if tool_name not in self.tools:
             raise ValueError(f"Tool {tool_name} not found")
         
-        tool = self.tools[tool_name]
+        tool, runner = self.tools[tool_name]
         try:
-            result = await tool.arun(**kwargs) if hasattr(tool, 'arun') else tool.run(**kwargs)
-            self.logger.info(f"Tool {tool_name} executed successfully")
+            result = await runner(**kwargs)
+            self.logger.info("Tool %s executed successfully", tool_name)
             return result
         except Exception as e:
-            self.logger.error(f"Error executing tool {tool_name}: {e}")
+            self.logger.error("Error executing tool %s: %s", tool_name, e)
             raise
 
 
@@ -294,7 +510,7 @@ if __name__ == "__main__":
             content={"type": "analyze", "data": {"sample": "data"}}
         )
         
-        await agent.message_queue.put(test_message)
+        await agent.enqueue_message(test_message)
         
         # Keep agent running
         await asyncio.sleep(10)
@@ -302,5 +518,12 @@ if __name__ == "__main__":
         # Stop agent
         await agent.stop()
     
-    # Run the example
+    # Run the example; uvloop's libuv-based event loop is typically
+    # 2-4x faster on queue and socket operations where available
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # Fall back to the default event loop (e.g. on Windows)
+
     asyncio.run(main())
\ No newline at end of file